@@ -0,0 +1,334 @@
+/*
+ * Optional C accelerator for arithmetic_exp.evaluate().
+ *
+ * evaluate_c(s) takes the whitespace-free, already validated expression and
+ * evaluates it in one left-to-right pass with the same rules as the Python
+ * implementation: binary operators share one precedence level, a '+'/'-' sign
+ * is only allowed directly before digits or '(' and division truncates toward
+ * zero with exact integer math. Returns the int result, or None on a malformed
+ * expression or a division by zero. Values stay Python ints, so big numbers
+ * still work; only the per-character dispatch is done in C.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+/* Digits accumulated in a long long before falling back to PyLong_FromString */
+#define MAX_FAST_DIGITS 18
+/* Digits converted by one PyLong_FromString call, the lowest value
+ * sys.int_max_str_digits accepts */
+#define MAX_CHUNK_DIGITS 640
+/* Nesting depth handled without a heap allocation */
+#define INLINE_DEPTH 64
+
+/* Cached int constants 0, 1 and 10, created at module init */
+static PyObject *zero;
+static PyObject *one;
+static PyObject *ten;
+
+typedef struct {
+    PyObject *acc;  /* value of the group so far, NULL before its first operand */
+    char op;        /* pending binary operator, applied to the next operand */
+    char negate;    /* the group was opened by "-(" */
+} Frame;
+
+/* Apply op to (a, b), stealing both references. Returns a new reference,
+ * Py_None (new reference) on division by zero or NULL with an exception set. */
+static PyObject *
+apply_op(PyObject *a, char op, PyObject *b)
+{
+    PyObject *res = NULL;
+
+    switch (op) {
+    case '+':
+        res = PyNumber_Add(a, b);
+        break;
+    case '-':
+        res = PyNumber_Subtract(a, b);
+        break;
+    case '*':
+        res = PyNumber_Multiply(a, b);
+        break;
+    case '/': {
+        int nonzero = PyObject_IsTrue(b);
+        if (nonzero < 0) {
+            break;
+        }
+        if (!nonzero) {
+            res = Py_NewRef(Py_None);
+            break;
+        }
+        /* Floor division, then truncate toward zero: the remainder takes the
+         * sign of b, so a non-zero remainder with a sign other than a's means
+         * the operands had different signs and the floor is one too low */
+        PyObject *qr = PyNumber_Divmod(a, b);
+        if (qr == NULL) {
+            break;
+        }
+        PyObject *q = PyTuple_GET_ITEM(qr, 0);
+        PyObject *r = PyTuple_GET_ITEM(qr, 1);
+        int r_nonzero = PyObject_IsTrue(r);
+        int r_neg = PyObject_RichCompareBool(r, zero, Py_LT);
+        int a_neg = PyObject_RichCompareBool(a, zero, Py_LT);
+        if (r_nonzero < 0 || r_neg < 0 || a_neg < 0) {
+            Py_DECREF(qr);
+            break;
+        }
+        if (r_nonzero && r_neg != a_neg) {
+            res = PyNumber_Add(q, one);
+        }
+        else {
+            res = Py_NewRef(q);
+        }
+        Py_DECREF(qr);
+        break;
+    }
+    default:
+        res = Py_NewRef(Py_None);
+        break;
+    }
+    Py_DECREF(a);
+    Py_DECREF(b);
+    return res;
+}
+
+/* Convert the n digits at s to an int. sys.int_max_str_digits can not be set
+ * below MAX_CHUNK_DIGITS, so longer runs are split in halves and joined as
+ * high * 10**len(low) + low - PyLong_FromString never sees more digits than the
+ * limit allows, and the result is exact like the Python evaluator's */
+static PyObject *
+digits_to_long(const char *s, Py_ssize_t n)
+{
+    if (n <= MAX_CHUNK_DIGITS) {
+        char buf[MAX_CHUNK_DIGITS + 1];
+        memcpy(buf, s, n);
+        buf[n] = '\0';
+        return PyLong_FromString(buf, NULL, 10);
+    }
+
+    Py_ssize_t half = n / 2;
+    PyObject *res = NULL;
+    PyObject *scale = NULL;
+    PyObject *high = digits_to_long(s, half);
+    PyObject *low = digits_to_long(s + half, n - half);
+    PyObject *exponent = PyLong_FromSsize_t(n - half);
+    if (high == NULL || low == NULL || exponent == NULL) {
+        goto done;
+    }
+    scale = PyNumber_Power(ten, exponent, Py_None);
+    if (scale == NULL) {
+        goto done;
+    }
+    PyObject *shifted = PyNumber_Multiply(high, scale);
+    if (shifted == NULL) {
+        goto done;
+    }
+    res = PyNumber_Add(shifted, low);
+    Py_DECREF(shifted);
+done:
+    Py_XDECREF(high);
+    Py_XDECREF(low);
+    Py_XDECREF(exponent);
+    Py_XDECREF(scale);
+    return res;
+}
+
+/* Parse the digit run starting at s[*pos], advancing *pos past it */
+static PyObject *
+parse_number(const char *s, Py_ssize_t n, Py_ssize_t *pos)
+{
+    Py_ssize_t start = *pos;
+    Py_ssize_t i = start;
+    long long v = 0;
+
+    while (i < n && s[i] >= '0' && s[i] <= '9') {
+        if (i - start < MAX_FAST_DIGITS) {
+            v = v * 10 + (s[i] - '0');
+        }
+        i++;
+    }
+    *pos = i;
+    if (i - start <= MAX_FAST_DIGITS) {
+        return PyLong_FromLongLong(v);
+    }
+    /* Too long for a long long - let CPython convert it */
+    return digits_to_long(s + start, i - start);
+}
+
+static PyObject *
+evaluate_c(PyObject *module, PyObject *arg)
+{
+    Py_ssize_t n;
+    const char *s = PyUnicode_AsUTF8AndSize(arg, &n);
+    if (s == NULL) {
+        return NULL;
+    }
+
+    Frame inline_frames[INLINE_DEPTH];
+    Frame *frames = inline_frames;
+    Py_ssize_t capacity = INLINE_DEPTH;
+    Py_ssize_t depth = 0;
+    PyObject *result = NULL;
+    int expecting_number = 1;
+    Py_ssize_t i = 0;
+
+    frames[0].acc = NULL;
+    frames[0].op = 0;
+    frames[0].negate = 0;
+
+    while (i < n) {
+        char ch = s[i];
+        PyObject *operand = NULL;
+
+        if (expecting_number) {
+            int open_group = 0;
+            char sign = 0;
+
+            if (ch == '+' || ch == '-') {
+                /* Unary sign - only valid directly before digits or '(' */
+                if (i + 1 >= n) {
+                    goto invalid;
+                }
+                sign = ch;
+                ch = s[++i];
+                if (ch == '(') {
+                    open_group = 1;
+                }
+                else if (ch < '0' || ch > '9') {
+                    goto invalid;
+                }
+            }
+            else if (ch == '(') {
+                open_group = 1;
+            }
+            else if (ch < '0' || ch > '9') {
+                /* ')' when we expected an operand (e.g., "()") or a binary operator */
+                goto invalid;
+            }
+
+            if (open_group) {
+                if (depth + 1 == capacity) {
+                    Py_ssize_t new_capacity = capacity * 2;
+                    Frame *grown = PyMem_Malloc(new_capacity * sizeof(Frame));
+                    if (grown == NULL) {
+                        PyErr_NoMemory();
+                        goto done;
+                    }
+                    memcpy(grown, frames, capacity * sizeof(Frame));
+                    if (frames != inline_frames) {
+                        PyMem_Free(frames);
+                    }
+                    frames = grown;
+                    capacity = new_capacity;
+                }
+                depth++;
+                frames[depth].acc = NULL;
+                frames[depth].op = 0;
+                frames[depth].negate = (sign == '-');
+                i++;
+                continue;
+            }
+
+            operand = parse_number(s, n, &i);
+            if (operand == NULL) {
+                goto done;
+            }
+            if (sign == '-') {
+                PyObject *neg = PyNumber_Negative(operand);
+                Py_DECREF(operand);
+                if (neg == NULL) {
+                    goto done;
+                }
+                operand = neg;
+            }
+            expecting_number = 0;
+        }
+        else {
+            /* Expect an operator or a closing ')' */
+            if (ch == '+' || ch == '-' || ch == '*' || ch == '/') {
+                frames[depth].op = ch;
+                expecting_number = 1;
+                i++;
+                continue;
+            }
+            if (ch != ')' || depth == 0) {
+                /* Number or '(' where operator expected, or an unmatched ')' */
+                goto invalid;
+            }
+            operand = frames[depth].acc;
+            frames[depth].acc = NULL;
+            if (frames[depth].negate) {
+                PyObject *neg = PyNumber_Negative(operand);
+                Py_DECREF(operand);
+                if (neg == NULL) {
+                    goto done;
+                }
+                operand = neg;
+            }
+            depth--;
+            i++;
+        }
+
+        /* Fold the operand into the current group, left-to-right */
+        Frame *f = &frames[depth];
+        if (f->acc == NULL) {
+            f->acc = operand;
+        }
+        else {
+            PyObject *applied = apply_op(f->acc, f->op, operand);
+            f->acc = NULL;
+            if (applied == NULL) {
+                goto done;
+            }
+            if (applied == Py_None) {
+                result = applied;
+                goto done;
+            }
+            f->acc = applied;
+        }
+    }
+
+    if (expecting_number || depth != 0) {
+        /* Empty input, trailing operator or some open '(' were not closed */
+        goto invalid;
+    }
+    result = frames[0].acc;
+    frames[0].acc = NULL;
+    goto done;
+
+invalid:
+    result = Py_NewRef(Py_None);
+done:
+    for (Py_ssize_t d = 0; d <= depth; d++) {
+        Py_XDECREF(frames[d].acc);
+    }
+    if (frames != inline_frames) {
+        PyMem_Free(frames);
+    }
+    return result;
+}
+
+static PyMethodDef methods[] = {
+    {"evaluate_c", evaluate_c, METH_O,
+     "Evaluate a whitespace-free, validated expression. Returns int or None."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef module = {
+    PyModuleDef_HEAD_INIT,
+    "_arithmetic_exp_c",
+    "C accelerator for arithmetic_exp.evaluate()",
+    -1,
+    methods
+};
+
+PyMODINIT_FUNC
+PyInit__arithmetic_exp_c(void)
+{
+    zero = PyLong_FromLong(0);
+    one = PyLong_FromLong(1);
+    ten = PyLong_FromLong(10);
+    if (zero == NULL || one == NULL || ten == NULL) {
+        return NULL;
+    }
+    return PyModule_Create(&module);
+}
@@ -1,211 +1,644 @@
+import functools
+import operator
+import re
+import sys
 import unittest
-from typing import Optional, Tuple
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    # Optional C accelerator, built with: python setup.py build_ext --inplace
+    from _arithmetic_exp_c import evaluate_c
+except ImportError:
+    evaluate_c = None
+
+try:
+    # Optional int64 fast path when the C accelerator is not available
+    import numba
+    import numpy as np
+except ImportError:
+    numba = None
 
 # ================================================================
 # Arithmetic Expression Evaluator
 # (inputs string and returns int() on success and None on failure)
 # ================================================================
 
-def evaluate(expression: str) -> Optional[int]:
-    """Evaluate arithmetic expression and return an integer result.
-    Returns:
-      - Computed integer on success
-      - None on error
+# Translate table deleting every character str.isspace() treats as whitespace
+# (all of them live below U+3001, the ideographic space is the last one)
+_WS = {c: None for c in range(0x3001) if chr(c).isspace()}
+
+# The ASCII whitespace bytes, deleted by bytes.translate() for the common ASCII input
+_WS_TABLE = bytes(c for c in range(128) if chr(c).isspace())
+
+# Valid characters in the assignment - whitespace, digits, operators and parentheses.
+# Matched against the raw input so the character check runs as one C-level regex scan
+_VALID = re.compile(r'[\s0-9+\-*/()]*')
+
+# Opcodes of the stack VM; PUSH and the memo slot opcodes take their operand from consts
+OP_PUSH, OP_ADD, OP_SUB, OP_MUL, OP_DIV, OP_NEG, OP_STORE, OP_LOAD = range(8)
+
+# Token kinds - a number that fits in int64 and the binary operators share their
+# opcode, so to_rpn() can emit them as is; TOK_BIG is a number beyond int64
+TOK_NUM, TOK_ADD, TOK_SUB, TOK_MUL, TOK_DIV = OP_PUSH, OP_ADD, OP_SUB, OP_MUL, OP_DIV
+TOK_BIG, TOK_LP, TOK_RP = 8, 9, 10
+
+_INT64_MAX = 2 ** 63 - 1
+_INT64_MIN = -2 ** 63
+
+# tokenize() scans the ASCII bytes of the expression, where s[i] is a plain int.
+# Token kind of every valid byte that is not a digit (digits are 0x30 to 0x39)
+_SYMBOLS = [-1] * 128
+for _c, _kind in zip(b'+-*/()', (TOK_ADD, TOK_SUB, TOK_MUL, TOK_DIV, TOK_LP, TOK_RP)):
+    _SYMBOLS[_c] = _kind
+del _c, _kind
+
+# Operator precedence used by the shunting-yard conversion, indexed by opcode.
+# The binary operators are evaluated strictly left-to-right (see test_left_to_right),
+# so all of them share one level; the unary minus over a parentheses binds tighter
+_PRECEDENCE = [0, 1, 1, 1, 1, 2]
+
+
+def _strip_whitespace(expression: str) -> str:
+    """Remove every whitespace character from the expression."""
+    # str.translate() looks every character up in the _WS dict; for ASCII input the
+    # bytes version is a plain C loop over a 256 entry table, several times faster
+    if expression.isascii():
+        return expression.encode('ascii').translate(None, _WS_TABLE).decode('ascii')
+    return expression.translate(_WS)
+
+
+class Tokens(NamedTuple):
+    """Tokens of an expression as parallel lists of ints (one entry per token).
+    kinds holds the TOK_* kind, values the number for TOK_NUM (its index into big for
+    TOK_BIG, 0 otherwise) and starts the index of the token in the expression.
+    """
+    kinds: List[int]
+    values: List[int]
+    starts: List[int]
+    big: List[int]
+
+
+# Digits accumulated one by one in tokenize(), always below _INT64_MAX
+_MAX_FAST_DIGITS = 18
+
+# Digits converted by one int() call, the lowest value sys.set_int_max_str_digits() accepts
+_INT_CHUNK_DIGITS = 640
+
+
+def _digits_to_int(digits: bytes) -> int:
+    """Convert the ASCII digit run to an int, however many digits it has."""
+    # int() refuses more than sys.get_int_max_str_digits() digits, so longer runs are
+    # split in halves and joined as high * 10**len(low) + low, like the C accelerator
+    n = len(digits)
+    if n <= _INT_CHUNK_DIGITS:
+        return int(digits)
+    half = n // 2
+    return _digits_to_int(digits[:half]) * 10 ** (n - half) + _digits_to_int(digits[half:])
+
+
+def tokenize(s: bytes) -> Tokens:
+    """Split the ASCII bytes of the whitespace-free, validated expression into tokens.
+    Returns the Tokens in input order.
     """
-    # Remove all whitespace
-    s = ''.join(ch for ch in expression if not ch.isspace())
+    kinds: List[int] = []
+    values: List[int] = []
+    starts: List[int] = []
+    big: List[int] = []
+    symbols = _SYMBOLS
+    # Bound appends, three of them run for every token
+    add_kind = kinds.append
+    add_value = values.append
+    add_start = starts.append
     n = len(s)
+    i = 0
+    while i < n:
+        ch = s[i]
+        add_start(i)
+        if 0x30 <= ch <= 0x39:  # b'0' to b'9'
+            # Accumulate short numbers directly, no substring or int() conversion needed;
+            # past _MAX_FAST_DIGITS that gets quadratic, so the run is converted at once
+            start = i
+            num = 0
+            while i < n and 0x30 <= s[i] <= 0x39 and i - start < _MAX_FAST_DIGITS:
+                num = num * 10 + s[i] - 0x30
+                i += 1
+            if i < n and 0x30 <= s[i] <= 0x39:
+                while i < n and 0x30 <= s[i] <= 0x39:
+                    i += 1
+                num = _digits_to_int(s[start:i])
+            if num <= _INT64_MAX:
+                add_kind(TOK_NUM)
+                add_value(num)
+            else:
+                add_kind(TOK_BIG)
+                add_value(len(big))
+                big.append(num)
+        else:
+            # Every other byte is a single character operator or parentheses
+            add_kind(symbols[ch])
+            add_value(0)
+            i += 1
+    return Tokens(kinds, values, starts, big)
 
-    # Reject any character not in valid tokens in the assignment
-    allowed = set("0123456789+-*/()")
-    for ch in s:
-        if ch not in allowed:
-            return None
-
-    # Verify the parentheses
-    # Ensure number of open ')' is same as closed '('
-    balance = 0
-    for ch in s:
-        if ch == '(':
-            balance += 1
-        elif ch == ')':
-            balance -= 1
-            if balance < 0:
+
+# Division with truncation toward zero; '+', '-' and '*' map straight to operator functions
+def truncate_div(a: int, b: int) -> int:
+    """Divide a by b, truncating the result toward zero.
+    Raises ZeroDivisionError when b is 0.
+    """
+    # Integer floor division, then truncate toward zero - exact for any size of int,
+    # unlike int(a / b) which goes through a float
+    q, r = divmod(a, b)
+    if r and (a < 0) != (b < 0):
+        q += 1
+    return q
+
+
+# Pair every '(' token with its ')' in one pass, also verifying the parentheses
+def match_parentheses(kinds: List[int]) -> Optional[List[int]]:
+    """Find the matching parentheses token of every '(' and ')'.
+    Returns the list match[i] = j on success, None when the parentheses are unbalanced.
+    """
+    match = [-1] * len(kinds)
+    stack: List[int] = []
+    for i, kind in enumerate(kinds):
+        if kind == TOK_LP:
+            stack.append(i)
+        elif kind == TOK_RP:
+            if not stack:
                 # Found a closing ')' without a matching open '('
                 return None
-    if balance != 0:
+            j = stack.pop()
+            match[j] = i
+            match[i] = j
+    if stack:
         # Mismatch: some open '(' were not closed
         return None
+    return match
 
-    # Method to parse and convert the number to int along with optional unary +/-, requires at least one digit
-    def parse_number(i: int) -> Tuple[Optional[int], int]:
-        """Parse a signed integer.
-        Returns (value, next_i) on success, (None, i) on failure.
-        """
-        if i >= n:
-            return None, i
-
-        #Expecting number, handling the optional unary sign before digits
-        sign_char = None
-        if s[i] in '+-':
-            sign_char = s[i]
-            i += 1
-            if i >= n:
-                # Sign cannot be last string, it is an error
-                return None, i
 
-        # Collect all the digits of the number
-        start = i
-        while i < n and s[i].isdigit():
-            i += 1
+# Longest group text memoized by to_rpn()
+_MEMO_MAX_LEN = 64
 
-        if i == start:
-            # No digits after optional sign → invalid number
-            return None, start
-
-        # Convert string to int
-        num_str = s[start:i]
-        try:
-            num = int(num_str)
-            if sign_char == '-':
-                num = -num  # apply sign when it is '-' as + is optional
-            return num, i
-        except ValueError:
-            # Shouldn't occur as we already check for isdigit(), but safe to handle
-            return None, start
-
-    # Method to implement the valid arithmetic operation with truncation-toward-zero division
-    def perform_arithmetic_op(a: int, op: str, b: int) -> Optional[int]:
-        """Implement the arithmetic operation(op) on the operands(a,b).
-        Returns value on success, None on failure.
-        """
-        if op == '+':
-            return a + b
-        if op == '-':
-            return a - b
-        if op == '*':
-            return a * b
-        if op == '/':
-            if b == 0:
+
+# Convert the tokens into reverse polish notation (shunting-yard algorithm)
+def to_rpn(s: bytes, tokens: Tokens) -> Optional[Tuple[List[int], List[int]]]:
+    """Reorder the tokens of s so that every operator follows its operands.
+    Returns the parallel (opcodes, operands) lists on success, None on a malformed expression.
+    """
+    # Same 2 main cases as in a hand written parser -
+    # case 1. expecting numbers - at the start, after an operator and after '('.
+    # A '+'/'-' here is the unary sign and must be followed by digits or by '('.
+    # Sign before digits is folded into the number itself; '-' before '(' is pushed
+    # as the NEG operator which negates the subexpression, '+' before '(' is a no-op.
+    # case 2. expecting operator or closing parentheses - after a number or ')'.
+    # Operators wait on the ops stack until an operator of lower or same precedence
+    # (left-to-right) or the closing ')' of their group moves them to the output.
+    # Every closed group up to _MEMO_MAX_LEN characters is memoized by its text: the first
+    # occurrence stores its value in a slot, any repeat of the same text (e.g.
+    # "(a+b)*(a+b)") just loads it from the slot and jumps straight to its matching ')'.
+    # Longer groups are not memoized, so slicing the keys stays linear in the input even
+    # for deeply nested groups.
+    kinds, values, starts, big = tokens
+    match = match_parentheses(kinds)
+    if match is None:
+        return None
+    code: List[int] = []
+    consts: List[int] = []
+    # Pending binary opcodes, OP_NEG and TOK_LP for every open group
+    ops: List[int] = []
+    # Text of every open group still on the ops stack, None when it is too long to memoize
+    groups: List[Optional[bytes]] = []
+    subexpr_cache: Dict[bytes, int] = {}
+    expecting_number = True
+    n = len(kinds)
+    i = 0
+
+    while i < n:
+        kind = kinds[i]
+
+        if expecting_number:
+            if kind == TOK_NUM or kind == TOK_BIG:
+                code.append(OP_PUSH)
+                consts.append(values[i] if kind == TOK_NUM else big[values[i]])
+                expecting_number = False
+            elif kind == TOK_LP:
+                close = match[i]
+                start, end = starts[i] + 1, starts[close]
+                key = s[start:end] if end - start <= _MEMO_MAX_LEN else None
+                slot = None if key is None else subexpr_cache.get(key)
+                if slot is None:
+                    ops.append(kind)
+                    groups.append(key)
+                else:
+                    # Same subexpression seen before - reuse the value, skip to its ')'
+                    code.append(OP_LOAD)
+                    consts.append(slot)
+                    expecting_number = False
+                    i = close
+            elif kind == TOK_ADD or kind == TOK_SUB:
+                # Unary sign - only valid directly before digits or '('
+                if i + 1 >= n:
+                    return None
+                next_kind = kinds[i + 1]
+                if next_kind == TOK_NUM or next_kind == TOK_BIG:
+                    i += 1
+                    value = values[i] if next_kind == TOK_NUM else big[values[i]]
+                    code.append(OP_PUSH)
+                    consts.append(-value if kind == TOK_SUB else value)
+                    expecting_number = False
+                elif next_kind == TOK_LP:
+                    if kind == TOK_SUB:
+                        ops.append(OP_NEG)
+                else:
+                    return None
+            else:
+                # ')' when we expected an operand (e.g., "()") or a binary operator
+                return None
+
+        else:
+            # Expect an operator or a closing ')'
+            if kind == TOK_RP:
+                # match_parentheses() guarantees the '(' is on the ops stack
+                while ops[-1] != TOK_LP:
+                    code.append(ops.pop())
+                    consts.append(0)
+                ops.pop()
+                key = groups.pop()
+                if key is not None:
+                    slot = subexpr_cache[key] = len(subexpr_cache)
+                    code.append(OP_STORE)
+                    consts.append(slot)
+            elif TOK_ADD <= kind <= TOK_DIV:
+                prec = _PRECEDENCE[kind]
+                while ops and ops[-1] != TOK_LP and _PRECEDENCE[ops[-1]] >= prec:
+                    code.append(ops.pop())
+                    consts.append(0)
+                ops.append(kind)
+                expecting_number = True
+            else:
+                # Number or '(' where operator expected
                 return None
-            # Truncate toward zero
-            return int(a / b)
+
+        i += 1
+
+    if expecting_number:
+        # Empty input or trailing operator
         return None
+    while ops:
+        code.append(ops.pop())
+        consts.append(0)
+    return code, consts
 
-    # Parse an expression (parentheses-first, left-to-right within level and parentheses close)
-    def parse_expression(i: int, sub_expr: bool = False)-> tuple[Optional[int], int, bool]:
-        """Parse expression from left to right.
-        Returns (value, next_i, ok).
-        If sub_expr=True, stop at a matching ')'.
-        """
-        result: Optional[int] = None
-        current_op: Optional[str] = None
-        expecting_number = True
-
-        # This is how I approached -
-        # 2 main cases -
-        # case 1. expecting numbers -(numbers are expected 1.after a unary operator followed by parentheses
-        # 2.after a parentheses, 3.after a unary operator and also 4.after
-        # an operator) - these scenarios are hit with expecting_number set to True.
-        # case 2. expecting operator or closing parentheses
-        # Next main logic is recursive call to parse the sub expression within the parentheses, in 2 cases -
-        # 1. when a unary operator followed by '(' like +( 2. '(' is encountered
-        # to differentiate the recursive call, bool sub_expr is set to true in parse_expression.
-
-        while i < n:
-            ch = s[i]
-
-            if expecting_number:
-                # Unary sign directly before a parentheses of a subexpression
-                # +(expr) is a no-op; -(expr) negates the subexpression
-                if ch in '+-' and i + 1 < n and s[i + 1] == '(':
-                    unary = -1 if ch == '-' else 1
-                    # Advance to '(' and parse the subexpression
-                    i += 1  # now s[i] == '('
-                    sub_val, next_i, ok = parse_expression(i + 1, sub_expr=True)
-                    if not ok or sub_val is None:
-                        return None, i, False
-                    i = next_i
-                    # apply unary operator outside the parentheses to the result
-                    operand = unary * sub_val
-
-                elif ch == '(':
-                    # Recurse into subexpression
-                    sub_val, next_i, ok = parse_expression(i + 1, sub_expr=True)
-                    if not ok or sub_val is None:
-                        return None, i, False
-                    i = next_i
-                    operand = sub_val
-
-                elif ch.isdigit() or ch in '+-':
-                    # Parse signed number (sign must be followed by digits) - this is the unary sign
-                    # before the number
-                    value, next_i = parse_number(i)
-                    if value is None:
-                        return None, i, False
-                    i = next_i
-                    operand = value
-
-                elif ch == ')':
-                    # Can't close group when we expected an operand (e.g., "()")
-                    # This is not expected, still safe to catch and return error
-                    return None, i, False
 
-                else:
-                    # Any other character would have been filtered earlier
-                    return None, i, False
+# ================================================================
+# Compiled expressions - the RPN as a small bytecode for a stack VM
+# ================================================================
+
+class Program(NamedTuple):
+    """Compiled expression - parallel opcode and operand tuples, constant folded to a
+    single PUSH unless the expression divides by zero. slots is the number of memo slots
+    used by the STORE/LOAD opcodes.
+    """
+    code: Tuple[int, ...]
+    consts: Tuple[int, ...]
+    slots: int
+
+
+def _binary(fn: Callable[[int, int], int]) -> Callable[[List[int], int, List[int]], None]:
+    """Build the VM handler replacing the top two values a, b with fn(a, b)."""
+    def run(stack: List[int], arg: int, memo: List[int]) -> None:
+        b = stack.pop()
+        stack[-1] = fn(stack[-1], b)
+    return run
+
+
+def _push(stack: List[int], arg: int, memo: List[int]) -> None:
+    stack.append(arg)
+
+
+def _neg(stack: List[int], arg: int, memo: List[int]) -> None:
+    # "-(expr)" negates whatever value the subexpression left on top of the stack
+    stack[-1] = -stack[-1]
+
+
+def _store(stack: List[int], arg: int, memo: List[int]) -> None:
+    memo[arg] = stack[-1]
+
+
+def _load(stack: List[int], arg: int, memo: List[int]) -> None:
+    stack.append(memo[arg])
 
-                # Organise operands into the expression, first operand is copied to result
-                if result is None:
-                    result = operand
-                else:
-                    if current_op is None:
-                        return None, i, False
-                    applied = perform_arithmetic_op(result, current_op, operand)
-                    if applied is None:
-                        return None, i, False
-                    result = applied
-                # set to false before leaving
-                expecting_number = False
 
+# VM dispatch table, indexed by opcode
+_HANDLERS = [_push, _binary(operator.add), _binary(operator.sub), _binary(operator.mul),
+             _binary(truncate_div), _neg, _store, _load]
+
+
+def _run_vm(code: Sequence[int], consts: Sequence[int], slots: int) -> Optional[int]:
+    """Run the opcodes on the stack VM, slots memo slots are used by STORE/LOAD.
+    Returns value on success, None on division by zero.
+    """
+    stack: List[int] = []
+    memo = [0] * slots
+    handlers = _HANDLERS
+    try:
+        for op, arg in zip(code, consts):
+            handlers[op](stack, arg, memo)
+    except ZeroDivisionError:
+        return None
+    # to_rpn() only lets through well formed expressions, leaving exactly one value
+    return stack.pop()
+
+
+# Binary opcode -> function computing it, used to fold constant operands at compile time
+_FOLD = {OP_ADD: operator.add, OP_SUB: operator.sub, OP_MUL: operator.mul, OP_DIV: truncate_div}
+
+
+def _fold_constants(code: List[int], consts: List[int]) -> Tuple[List[int], List[int]]:
+    """Fold every constant subexpression of the opcodes into a single PUSH.
+    Returns the folded (opcodes, operands) lists.
+    """
+    # One pass is a fixed point - RPN has the operands of every operator before it, so
+    # they are already folded when the operator is reached. Every operator also finds an
+    # instruction in the output for each value it reads, so the out_code[-1] and
+    # out_code[-2] lookups below stay in range. Two adjacent PUSH instructions at the end
+    # of the output push exactly the two values on top of the VM stack. A STORE after a
+    # PUSH is dropped rather than kept between them, so folding sees through memoized
+    # groups; a STORE is only kept after an opcode that was not folded.
+    # A division by zero is left in place, and with it every operator using its result,
+    # so what is left of a program that does not fold to one PUSH fails on every run.
+    out_code: List[int] = []
+    out_consts: List[int] = []
+    # Constant value of every memo slot whose group folded to a PUSH
+    known: Dict[int, int] = {}
+    for op, arg in zip(code, consts):
+        if op == OP_LOAD and arg in known:
+            op, arg = OP_PUSH, known[arg]
+
+        if op == OP_STORE and out_code[-1] == OP_PUSH:
+            known[arg] = out_consts[-1]
+            continue
+        if op == OP_NEG and out_code[-1] == OP_PUSH:
+            out_consts[-1] = -out_consts[-1]
+            continue
+        if op in _FOLD and out_code[-1] == OP_PUSH and out_code[-2] == OP_PUSH:
+            try:
+                value = _FOLD[op](out_consts[-2], out_consts[-1])
+            except ZeroDivisionError:
+                pass
             else:
-                # Expect an operator or a closing ')'
-                if ch in '+-*/':
-                    current_op = ch
-                    i += 1
-                    expecting_number = True
-                elif ch == ')':
-                    if sub_expr:
-                        i += 1
-                        # Cannot end with a pending operator
-                        if result is None or (current_op is not None and expecting_number):
-                            return None, i, False
-                        return result, i, True
-                    else:
-                        # Unmatched ')'
-                        return None, i, False
-                else:
-                    # Invalid where operator expected
-                    return None, i, False
+                out_code.pop()
+                out_consts.pop()
+                out_consts[-1] = value
+                continue
+
+        out_code.append(op)
+        out_consts.append(arg)
+    return out_code, out_consts
+
+
+def _compile_impl(s: str) -> Optional[Program]:
+    """Compile the whitespace-free, validated expression s.
+    Returns the Program on success, None on a malformed expression.
+    """
+    # Folding leaves a single PUSH of the value of every expression that can succeed, so
+    # the accelerated evaluator builds those; only the rest go through the opcodes
+    value = _evaluate_impl(s)
+    if value is not None:
+        return Program((OP_PUSH,), (value,), 0)
+    # Validation left only ASCII characters, and bytes index as ints without allocating
+    b = s.encode('ascii')
+    rpn = to_rpn(b, tokenize(b))
+    if rpn is None:
+        return None
+    code, consts = rpn
+    # Slot numbers are kept as assigned by to_rpn(), even if folding removed some of them
+    slots = code.count(OP_STORE)
+    code, consts = _fold_constants(code, consts)
+    return Program(tuple(code), tuple(consts), slots)
+
+
+# Compiling is the expensive part, so programs of compile_expression() callers are cached
+_compile_cached = functools.lru_cache(maxsize=4096)(_compile_impl)
+
+
+def compile_expression(expression: str) -> Optional[Program]:
+    """Compile arithmetic expression for repeated evaluate_compiled() calls.
+    Returns:
+      - Program on success
+      - None on a malformed expression
+    """
+    # Reject any character not in valid tokens in the assignment
+    if _VALID.fullmatch(expression) is None:
+        return None
+    return _compile_cached(_strip_whitespace(expression))
+
+
+def evaluate_compiled(program: Optional[Program]) -> Optional[int]:
+    """Run a Program returned by compile_expression().
+    Returns:
+      - Computed integer on success
+      - None on error (malformed expression or division by zero)
+    """
+    if program is None:
+        return None
+    if len(program.code) == 1:
+        # Folded to a single PUSH, nothing left to run
+        return program.consts[0]
+    return _run_vm(program.code, program.consts, program.slots)
+
+
+def _evaluate_py(s: str) -> Optional[int]:
+    """Evaluate the whitespace-free, validated expression s in pure Python.
+    Returns value on success, None on error.
+    """
+    # evaluate() caches the result, so the RPN runs once on the VM without building a
+    # Program - folding it first would only add work
+    b = s.encode('ascii')
+    rpn = to_rpn(b, tokenize(b))
+    if rpn is None:
+        return None
+    code, consts = rpn
+    return _run_vm(code, consts, code.count(OP_STORE))
+
+
+# int64 fast path compiled with Numba, used when the C accelerator is not built.
+# Inputs whose numbers or intermediate results leave the int64 range, or that nest
+# deeper than _JIT_MAX_DEPTH, report overflow and go through _evaluate_py() instead
+_JIT_MAX_DEPTH = 64
+
+
+def _evaluate_i64_kernel(buf):
+    """Evaluate the ASCII bytes of a whitespace-free, validated expression in int64.
+    Returns (value, ok, overflow); ok is False on error, overflow asks for the fallback.
+    """
+    # Same single pass as the C accelerator - one frame of (value, pending operator,
+    # negate) per open '(' with the operands folded into it left-to-right
+    n = buf.shape[0]
+    acc = np.zeros(_JIT_MAX_DEPTH, np.int64)
+    has_acc = np.zeros(_JIT_MAX_DEPTH, np.bool_)
+    pending = np.zeros(_JIT_MAX_DEPTH, np.uint8)
+    negate = np.zeros(_JIT_MAX_DEPTH, np.bool_)
+    depth = 0
+    expecting_number = True
+    i = 0
+
+    while i < n:
+        ch = buf[i]
+
+        if expecting_number:
+            negative = False
+            if ch == 43 or ch == 45:
+                # Unary sign - only valid directly before digits or '('
+                if i + 1 >= n:
+                    return 0, False, False
+                negative = ch == 45
+                i += 1
+                ch = buf[i]
+                if ch != 40 and (ch < 48 or ch > 57):
+                    return 0, False, False
+            if ch == 40:
+                depth += 1
+                if depth == _JIT_MAX_DEPTH:
+                    return 0, False, True
+                acc[depth] = 0
+                has_acc[depth] = False
+                pending[depth] = 0
+                negate[depth] = negative
+                i += 1
+                continue
+            if ch < 48 or ch > 57:
+                return 0, False, False
+            operand = 0
+            while i < n and 48 <= buf[i] <= 57:
+                digit = buf[i] - 48
+                if operand > (_INT64_MAX - digit) // 10:
+                    return 0, False, True
+                operand = operand * 10 + digit
+                i += 1
+            if negative:
+                operand = -operand
+            expecting_number = False
+
+        else:
+            if ch == 43 or ch == 45 or ch == 42 or ch == 47:
+                pending[depth] = ch
+                expecting_number = True
+                i += 1
+                continue
+            if ch != 41 or depth == 0:
+                return 0, False, False
+            operand = acc[depth]
+            if negate[depth]:
+                if operand == _INT64_MIN:
+                    return 0, False, True
+                operand = -operand
+            depth -= 1
+            i += 1
+
+        if not has_acc[depth]:
+            acc[depth] = operand
+            has_acc[depth] = True
+            continue
+
+        a = acc[depth]
+        b = operand
+        op = pending[depth]
+        if op == 43:
+            if (b > 0 and a > _INT64_MAX - b) or (b < 0 and a < _INT64_MIN - b):
+                return 0, False, True
+            acc[depth] = a + b
+        elif op == 45:
+            if (b < 0 and a > _INT64_MAX + b) or (b > 0 and a < _INT64_MIN + b):
+                return 0, False, True
+            acc[depth] = a - b
+        elif op == 42:
+            if a == _INT64_MIN or b == _INT64_MIN:
+                return 0, False, True
+            if a != 0 and abs(b) > _INT64_MAX // abs(a):
+                return 0, False, True
+            acc[depth] = a * b
+        else:
+            if b == 0:
+                return 0, False, False
+            if a == _INT64_MIN or b == _INT64_MIN:
+                return 0, False, True
+            q = abs(a) // abs(b)
+            acc[depth] = -q if (a < 0) != (b < 0) else q
 
-        # End-of-string or expression handling any incomplete errors
-        if sub_expr:
-            # if still sub_expr is true, which means we have not encountered closing ')'
-            return None, i, False
-        if result is None or expecting_number:
-            # Empty input or trailing operator
-            return None, i, False
-        return result, i, True
+    if expecting_number or depth != 0:
+        return 0, False, False
+    return acc[0], True, False
+
+
+if numba is not None:
+    _evaluate_i64 = numba.njit(cache=True)(_evaluate_i64_kernel)
+else:
+    _evaluate_i64 = None
+
+
+def _evaluate_jit(s: str) -> Optional[int]:
+    """Evaluate the whitespace-free, validated expression s with the Numba kernel.
+    Returns value on success, None on error.
+    """
+    value, ok, overflow = _evaluate_i64(np.frombuffer(s.encode('ascii'), dtype=np.uint8))
+    if overflow:
+        # Big numbers or deep nesting, keep the exact Python int semantics
+        return _evaluate_py(s)
+    return int(value) if ok else None
+
+
+def _evaluate_impl(s: str) -> Optional[int]:
+    """Evaluate the whitespace-free, validated expression s.
+    Returns value on success, None on error.
+    """
+    if evaluate_c is not None:
+        return evaluate_c(s)
+    if _evaluate_i64 is not None:
+        return _evaluate_jit(s)
+    return _evaluate_py(s)
 
-    # Kick off the top-level expression parse
-    final_val, _, ok = parse_expression(0, sub_expr=False)
-    return final_val if ok else None
 
+# The result only depends on the expression, so repeated expressions are served from
+# an LRU cache keyed by the whitespace-free string ("1+2" and " 1 + 2 " share a slot)
+_cached = functools.lru_cache(maxsize=4096)(_evaluate_impl)
+
+
+def evaluate(expression: str) -> Optional[int]:
+    """Evaluate arithmetic expression and return an integer result.
+    Returns:
+      - Computed integer on success
+      - None on error
+    """
+    # Reject any character not in valid tokens in the assignment
+    if _VALID.fullmatch(expression) is None:
+        return None
+    return _cached(_strip_whitespace(expression))
+
+
+evaluate.cache_clear = _cached.cache_clear
+evaluate.cache_info = _cached.cache_info
 
 # ============================================================
 # Different test scenarios
 # ============================================================
 
+# Whitespace-free inputs every accelerated evaluator must agree with _evaluate_py() on,
+# including numbers and intermediate results beyond the int64 range
+_PARITY_CASES = [
+    "1+3", "(1+3)*2", "4+(12/(1*2))", "(1+(12*2)", ")1+2(", "1)+(2", "()",
+    "", "1+", "+", "-", "20/-4/+2", "4*-(2+3)", "-(-3)", "+(-5)", "+-5",
+    "2(3)", "(2)3", "10/0", "(1+2)/(3-3)", "-7/2", "(1+2)*(1+2)",
+    "9223372036854775807+1", "-9223372036854775807-1-1", "3037000500*3037000500",
+    "123456789012345678901234567890*-98765432109876543210",
+    "100000000000000001/2", "-9223372036854775807-1/3",
+    "(" * 100 + "-1" + ")" * 100, "-(" * 100 + "1" + ")" * 100,
+    # more digits than sys.get_int_max_str_digits() lets int() convert
+    "1" * 5000, "-" + "9" * 5000 + "/3",
+]
+
+
 class EvaluateExpressionTests(unittest.TestCase):
     def assertEval(self, expr: str, expected: Optional[int]):
         got = evaluate(expr)
@@ -229,6 +662,7 @@ class EvaluateExpressionTests(unittest.TestCase):
         self.assertEval("(1+2))", None)        # extra ')'
         self.assertEval("((1+2)", None)        # missing ')'
         self.assertEval("1 + 2)", None)        # unmatched ')'
+        self.assertEval("1)+(2", None)         # balanced count but ')' before '('
         self.assertEval("", None)              # handled later as empty (but OK)
         self.assertEval("((2))", 2)            # considering valid to return a value
         self.assertEval("((2 + 3) * 4) / 5", 4) # nested parentheses
@@ -242,6 +676,8 @@ class EvaluateExpressionTests(unittest.TestCase):
     def test_whitespace(self):
         self.assertEval("  7   -   2   ", 5)
         self.assertEval("(  8+2 )/ 5  ", 2)
+        self.assertEval("\t1\n+\r2\f", 3)      # any str.isspace() char is ignored
+        self.assertEval("1\u00a0+\u30002", 3)   # including non-ASCII whitespace
 
     # Signed integers (+/- before numbers) testcases
     def test_signed_integers(self):
@@ -261,6 +697,30 @@ class EvaluateExpressionTests(unittest.TestCase):
         self.assertEval("+(-5)", -5)
         self.assertEval("-(+5)", -5)
 
+    # Repeated subexpressions are evaluated once and reused within the expression
+    def test_repeated_subexpressions(self):
+        self.assertEval("(1+2) * (1+2)", 9)
+        self.assertEval("-(1+2) * (1+2)", -9)
+        self.assertEval("((1+2)*2) - ((1+2)*2) + (1+2)", 3)
+        self.assertEval("(2) / (2-2) + (2-2)", None)
+
+    # Literals of any length are exact, even past sys.get_int_max_str_digits() digits
+    def test_long_literals(self):
+        # Compared with ==, the values have too many digits to format in a failure message
+        self.assertTrue(evaluate("1" * 5000) == (10 ** 5000 - 1) // 9)
+        self.assertTrue(_evaluate_py("-" + "9" * 100000 + "+1") == 2 - 10 ** 100000)
+        self.assertEqual(_evaluate_py("0" * 30 + "12345678901234567890"), 12345678901234567890)
+
+    # Division truncates toward zero with exact integer math, even beyond float precision
+    def test_division_truncation(self):
+        self.assertEval("7 / 2", 3)
+        self.assertEval("-7 / 2", -3)
+        self.assertEval("7 / -2", -3)
+        self.assertEval("-7 / -2", 3)
+        self.assertEval("100000000000000001 / 2", 50000000000000000)
+        self.assertEval("-100000000000000001 / 2", -50000000000000000)
+        self.assertEval("1" + "0" * 400 + " / 3" + "0" * 399, 3)
+
     # Division by zero testcases
     def test_division_by_zero(self):
         self.assertEval("10 / 0", None)
@@ -276,6 +736,85 @@ class EvaluateExpressionTests(unittest.TestCase):
         self.assertEval("√9", None)
         self.assertEval("x + y", None)
 
+    # Nesting depth is only limited by memory, the evaluators do not recurse
+    def test_deep_nesting(self):
+        depth = 5 * sys.getrecursionlimit()
+        self.assertEval("(" * depth + "1" + ")" * depth, 1)
+        self.assertEval("-(" * depth + "1" + ")" * depth, (-1) ** depth)
+        self.assertEval("(" * depth + "1" + ")" * (depth - 1), None)
+        self.assertEval("+".join(["1"] * depth), depth)
+        self.assertEqual(_evaluate_py("(" * depth + "2*(3)" + ")" * depth), 6)
+
+    # Long repeated groups are evaluated again, deep nesting stays linear in the input
+    def test_memo_length_bound(self):
+        def opcodes(s: str) -> List[int]:
+            b = s.encode('ascii')
+            return to_rpn(b, tokenize(b))[0]
+
+        self.assertEqual(opcodes("(1+2)*(1+2)").count(OP_LOAD), 1)
+        group = "(" + "+".join(["1"] * 50) + ")"
+        self.assertNotIn(OP_STORE, opcodes(group + "*" + group))
+        self.assertEval(group + "*" + group, 2500)
+        depth = 50000
+        self.assertEqual(_evaluate_py("(" * depth + "1" + ")" * depth), 1)
+        self.assertEqual(_evaluate_py("-(" * depth + "1+(1)" + ")" * depth), 2)
+
+    # Repeated expressions are answered from the cache, whitespace does not matter
+    def test_cache(self):
+        evaluate.cache_clear()
+        self.assertEval("1+2", 3)
+        self.assertEval(" 1 + 2 ", 3)
+        self.assertEval("1 / 0", None)
+        self.assertEval("1/0", None)
+        info = evaluate.cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 2))
+
+    # The C accelerator must agree with the Python evaluator
+    @unittest.skipIf(evaluate_c is None, "C accelerator not built")
+    def test_c_extension_matches_python(self):
+        for s in _PARITY_CASES:
+            self.assertEqual(evaluate_c(s), _evaluate_py(s), msg=repr(s))
+
+    # The Numba fast path must agree with the Python evaluator, falling back on overflow
+    @unittest.skipIf(_evaluate_i64 is None, "numba not installed")
+    def test_jit_matches_python(self):
+        for s in _PARITY_CASES:
+            self.assertEqual(_evaluate_jit(s), _evaluate_py(s), msg=repr(s))
+
+    # Compiled programs can be evaluated repeatedly without parsing again
+    def test_compiled(self):
+        program = compile_expression("(1 + 3) * 2")
+        self.assertIs(program, compile_expression("(1+3)*2"))
+        self.assertEqual(evaluate_compiled(program), 8)
+        self.assertEqual(evaluate_compiled(program), 8)
+        self.assertEqual(evaluate_compiled(compile_expression("-(1+2) * (1+2)")), -9)
+        self.assertEqual(evaluate_compiled(compile_expression("(1+2) / (3-3)")), None)
+        self.assertIsNone(compile_expression("1 +"))
+        self.assertIsNone(compile_expression("x + y"))
+        self.assertIsNone(evaluate_compiled(None))
+
+    # Constant subexpressions are folded at compile time, a division by zero is kept
+    def test_compiled_constant_folding(self):
+        def fold(s: str) -> Tuple[List[int], List[int]]:
+            b = s.encode('ascii')
+            return _fold_constants(*to_rpn(b, tokenize(b)))
+
+        self.assertEqual(fold("((((1+2))))"), ([OP_PUSH], [3]))
+        self.assertEqual(fold("(1+2)*(1+2)/-(4-5)"), ([OP_PUSH], [9]))
+        program = compile_expression("-(2 / (1-1)) + (3)")
+        self.assertEqual(program.code, (OP_PUSH, OP_PUSH, OP_DIV, OP_STORE, OP_NEG,
+                                        OP_PUSH, OP_ADD))
+        self.assertEqual(evaluate_compiled(program), None)
+        # Expressions that succeed are answered by the accelerated evaluator
+        self.assertEqual(compile_expression("(1+2) * 3"), Program((OP_PUSH,), (9,), 0))
+
+    # Deeply nested programs run on the VM like any other
+    def test_compiled_deep_nesting(self):
+        program = compile_expression("(" * 500 + "7 / (1-1)" + ")" * 500)
+        self.assertEqual(evaluate_compiled(program), None)
+        program = compile_expression("(" * 500 + "-1" + ")" * 500 + "*(2)*(2)")
+        self.assertEqual(evaluate_compiled(program), -4)
+
     # expression error testcases
     def test_structure_errors(self):
         self.assertEval("1 +", None)           # ends with operator
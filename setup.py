@@ -0,0 +1,10 @@
+from setuptools import Extension, setup
+
+# The C accelerator is optional: when it cannot be compiled the pure Python
+# evaluator in arithmetic_exp.py is installed and used on its own
+setup(
+    py_modules=["arithmetic_exp"],
+    ext_modules=[
+        Extension("_arithmetic_exp_c", ["_arithmetic_exp_c.c"], optional=True),
+    ],
+)